@@ -1,24 +1,19 @@
-import pandas as pd
 import networkx as nx
 from pyvis.network import Network
-from scholarly import scholarly
+from scholar_io import fetch_profiles
+from centrality import sparse_degree_centrality, sparse_eigenvector_centrality, parallel_path_centralities
+from network_html import load_pyvis_network, save_network_html
 from itertools import combinations
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import math
 import os
 
-def extract_scholar_profile(scholar_id):
-    """Extract single scholar profile and their coauthors"""
-    try:
-        author = scholarly.search_author_id(scholar_id)
-        author = scholarly.fill(author)
-        return {
-            "name": author.get("name", "N/A"),
-            "scholar_id": scholar_id,
-            "affiliation": author.get("affiliation", "N/A"),
-            "coauthors": author.get("coauthors", [])
-        }
-    except Exception as e:
-        print(f"Error retrieving data for ID {scholar_id}: {e}")
-        return None
+# Graphs larger than this estimate betweenness and closeness from a sample of
+# O(log n / eps^2) sources; with eps = 0.1 that is about 1,100 sources at 2,000 nodes
+APPROXIMATE_BETWEENNESS_MIN_NODES = 2000
+BETWEENNESS_EPSILON = 0.1
 
 def create_individual_network(profile):
     """Create network for a single professor"""
@@ -32,8 +27,7 @@ def create_individual_network(profile):
     G.add_node(prof_name, node_type="professor", title=f"{prof_name}<br>Professor<br>Affiliation: {profile['affiliation']}")
     
     # Add coauthors and connections
-    for coauthor in profile["coauthors"]:
-        coauthor_name = coauthor["name"]
+    for coauthor_name in profile["coauthors"]:
         G.add_node(coauthor_name, node_type="coauthor", title=f"{coauthor_name}<br>Coauthor")
         G.add_edge(prof_name, coauthor_name)
     
@@ -47,18 +41,15 @@ def visualize_individual_network_pyvis(G, professor_name):
     # Create a pyvis network
     net = Network(height="750px", width="100%", bgcolor="#ffffff", font_color="black")
     
-    # Copy the networkx graph to the pyvis network
-    for node in G.nodes():
-        node_type = G.nodes[node]['node_type']
-        title = G.nodes[node].get('title', node)
-        
-        if node_type == "professor":
-            net.add_node(node, label=node, title=title, color="#E41A1C", size=30)
-        else:
-            net.add_node(node, label=node, title=title, color="#377EB8", size=20)
-    
-    for edge in G.edges():
-        net.add_edge(edge[0], edge[1])
+    # Copy the networkx graph to the pyvis network in one bulk load
+    nodes = [
+        {"id": node, "title": attrs.get('title', node),
+         "color": "#E41A1C" if attrs['node_type'] == "professor" else "#377EB8",
+         "size": 30 if attrs['node_type'] == "professor" else 20}
+        for node, attrs in G.nodes(data=True)
+    ]
+    edges = [{"from": u, "to": v} for u, v in G.edges()]
+    load_pyvis_network(net, nodes, edges)
     
     # Set physics layout options
     net.barnes_hut(spring_length=200, spring_strength=0.01, damping=0.09)
@@ -68,7 +59,7 @@ def visualize_individual_network_pyvis(G, professor_name):
     
     # Save the network visualization
     filename = f"network_visualizations/individual_network_{professor_name.replace(' ', '_')}.html"
-    net.save_graph(filename)
+    save_network_html(net, filename)
     print(f"Network visualization saved to {filename}")
     
     return net
@@ -85,24 +76,38 @@ def find_shared_connections(profiles):
         if profile:
             prof_name = profile["name"]
             affiliation = profile["affiliation"]
-            coauthors = set(coauthor["name"] for coauthor in profile["coauthors"])
+            coauthors = set(profile["coauthors"])
             prof_coauthors[prof_name] = coauthors
             
             # Add professor node with affiliation info
             G.add_node(prof_name, node_type="professor", title=f"{prof_name}<br>Professor<br>Affiliation: {affiliation}")
     
-    # Find shared connections between professors
-    for (prof1, coauthors1), (prof2, coauthors2) in combinations(prof_coauthors.items(), 2):
-        shared = coauthors1.intersection(coauthors2)
-        if shared:
-            # Add edge between professors with shared connections
-            G.add_edge(prof1, prof2, weight=len(shared), shared_coauthors=list(shared))
-            
-            # Add shared coauthor nodes and their connections
-            for coauthor in shared:
-                G.add_node(coauthor, node_type="shared_coauthor", title=f"{coauthor}<br>Shared Coauthor")
-                G.add_edge(prof1, coauthor)
-                G.add_edge(prof2, coauthor)
+    # Invert the mapping so each coauthor lists the professors they worked with
+    coauthor_to_profs = defaultdict(list)
+    for prof_name, coauthors in prof_coauthors.items():
+        for coauthor in coauthors:
+            coauthor_to_profs[coauthor].append(prof_name)
+    
+    # Only coauthors with several professors produce shared connections
+    shared_map = defaultdict(list)
+    for coauthor, profs in coauthor_to_profs.items():
+        if len(profs) > 1:
+            for prof1, prof2 in combinations(profs, 2):
+                shared_map[(prof1, prof2)].append(coauthor)
+    
+    # Emit pairs in professor order so the graph matches the pairwise scan
+    prof_order = {prof_name: i for i, prof_name in enumerate(prof_coauthors)}
+    for prof1, prof2 in sorted(shared_map, key=lambda pair: (prof_order[pair[0]], prof_order[pair[1]])):
+        shared = shared_map[(prof1, prof2)]
+        
+        # Add edge between professors with shared connections
+        G.add_edge(prof1, prof2, weight=len(shared), shared_coauthors=shared)
+        
+        # Add shared coauthor nodes and their connections
+        for coauthor in shared:
+            G.add_node(coauthor, node_type="shared_coauthor", title=f"{coauthor}<br>Shared Coauthor")
+            G.add_edge(prof1, coauthor)
+            G.add_edge(prof2, coauthor)
     
     return G
 
@@ -115,23 +120,25 @@ def visualize_shared_network_pyvis(G):
     # Create a pyvis network
     net = Network(height="750px", width="100%", bgcolor="#ffffff", font_color="black")
     
-    # Copy the networkx graph to the pyvis network
-    for node in G.nodes():
-        node_type = G.nodes[node]['node_type']
-        title = G.nodes[node].get('title', node)
-        
-        if node_type == "professor":
-            net.add_node(node, label=node, title=title, color="#E41A1C", size=30)
-        elif node_type == "shared_coauthor":
-            net.add_node(node, label=node, title=title, color="#4DAF4A", size=20)
-    
-    for edge in G.edges():
+    # Copy the networkx graph to the pyvis network in one bulk load
+    shared_colors = {"professor": ("#E41A1C", 30), "shared_coauthor": ("#4DAF4A", 20)}
+    nodes = []
+    for node, attrs in G.nodes(data=True):
+        if attrs['node_type'] in shared_colors:
+            color, size = shared_colors[attrs['node_type']]
+            nodes.append({"id": node, "title": attrs.get('title', node), "color": color, "size": size})
+    
+    # Snapshot node types once instead of indexing the node view per edge
+    node_types = nx.get_node_attributes(G, 'node_type')
+    edges = []
+    for u, v, attrs in G.edges(data=True):
         # If edge is between two professors, use the weight (number of shared coauthors)
-        if G.nodes[edge[0]]['node_type'] == "professor" and G.nodes[edge[1]]['node_type'] == "professor":
-            weight = G[edge[0]][edge[1]].get('weight', 1)
-            net.add_edge(edge[0], edge[1], value=weight, title=f"Shared coauthors: {weight}")
+        if node_types[u] == "professor" and node_types[v] == "professor":
+            weight = attrs.get('weight', 1)
+            edges.append({"from": u, "to": v, "value": weight, "title": f"Shared coauthors: {weight}"})
         else:
-            net.add_edge(edge[0], edge[1])
+            edges.append({"from": u, "to": v})
+    load_pyvis_network(net, nodes, edges)
     
     # Set physics layout options
     net.barnes_hut(spring_length=250, spring_strength=0.01, damping=0.09)
@@ -141,7 +148,7 @@ def visualize_shared_network_pyvis(G):
     
     # Save the network visualization
     filename = "network_visualizations/shared_connections_network.html"
-    net.save_graph(filename)
+    save_network_html(net, filename)
     print(f"Shared connections visualization saved to {filename}")
     
     return net
@@ -151,9 +158,10 @@ def print_shared_connections(G):
     print("\nShared Connections Analysis:")
     shared_data = []
     
-    for (prof1, prof2) in G.edges():
-        if G.nodes[prof1]['node_type'] == "professor" and G.nodes[prof2]['node_type'] == "professor":
-            shared = G[prof1][prof2]['shared_coauthors']
+    node_types = nx.get_node_attributes(G, 'node_type')
+    for (prof1, prof2, attrs) in G.edges(data=True):
+        if node_types[prof1] == "professor" and node_types[prof2] == "professor":
+            shared = attrs['shared_coauthors']
             print(f"\n{prof1} and {prof2} share {len(shared)} coauthor(s):")
             for coauthor in shared:
                 print(f"  - {coauthor}")
@@ -163,25 +171,44 @@ def print_shared_connections(G):
                     "Shared Coauthor": coauthor
                 })
     
-    # Create a DataFrame for easier analysis
     if shared_data:
-        df = pd.DataFrame(shared_data)
-        
         # Create output directory if it doesn't exist
         os.makedirs("network_visualizations", exist_ok=True)
         
-        # Save to CSV
-        df.to_csv("network_visualizations/shared_coauthors.csv", index=False)
+        # Stream rows straight to CSV
+        with open("network_visualizations/shared_coauthors.csv", "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["Professor 1", "Professor 2", "Shared Coauthor"], lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(shared_data)
         print("Shared coauthor data saved to network_visualizations/shared_coauthors.csv")
 
-def analyze_network_statistics(G, professor_name):
+def betweenness_sample_size(n, epsilon=BETWEENNESS_EPSILON):
+    """Number of pivot sources needed to estimate betweenness within epsilon"""
+    return min(n, int(math.log2(n) / epsilon ** 2))
+
+def analyze_network_statistics(G, professor_name, approximate=None, workers=None):
     """Analyze network statistics for centrality and connectivity and save to CSV"""
-    degree_centrality = nx.degree_centrality(G)
-    closeness_centrality = nx.closeness_centrality(G)
-    betweenness_centrality = nx.betweenness_centrality(G)
+    n = G.number_of_nodes()
+    
+    # Sample path sources on very large graphs; the ranking is preserved
+    if approximate is None:
+        approximate = n > APPROXIMATE_BETWEENNESS_MIN_NODES
+    k = betweenness_sample_size(n) if approximate and n > 1 else None
+    if k is not None and k < n:
+        print(f"Estimating betweenness and closeness centrality for {professor_name} from {k} of {n} sources")
+    
+    # Build the sparse adjacency matrix once and derive the centralities from it
+    nodes = list(G.nodes())
+    A = nx.to_scipy_sparse_array(G, nodelist=nodes, dtype=float, weight=None, format="csr")
+    degree_centrality = dict(zip(nodes, sparse_degree_centrality(A).tolist()))
+    
+    # Closeness reuses the distances from the betweenness BFS, sampled or not
+    betweenness, closeness = parallel_path_centralities(A, workers=workers, k=k)
+    betweenness_centrality = dict(zip(nodes, betweenness.tolist()))
+    closeness_centrality = dict(zip(nodes, closeness.tolist()))
     
     try:
-        eigenvector_centrality = nx.eigenvector_centrality(G, max_iter=1000, tol=1e-6)
+        eigenvector_centrality = dict(zip(nodes, sparse_eigenvector_centrality(A).tolist()))
     except:
         # Handle case where eigenvector centrality may not converge
         print(f"Warning: Eigenvector centrality calculation didn't converge for {professor_name}'s network")
@@ -194,69 +221,76 @@ def analyze_network_statistics(G, professor_name):
     print(f"Betweenness Centrality: {betweenness_centrality[professor_name]:.3f}")
     print(f"Eigenvector Centrality: {eigenvector_centrality[professor_name]:.3f}")
     
-    # Create a DataFrame for all nodes
+    # Collect statistics rows for all nodes
     stats_data = []
-    for node in G.nodes():
+    for node, node_type in nx.get_node_attributes(G, 'node_type').items():
         stats_data.append({
             'Node': node,
-            'Node Type': G.nodes[node]['node_type'],
+            'Node Type': node_type,
             'Degree Centrality': degree_centrality[node],
             'Closeness Centrality': closeness_centrality[node],
             'Betweenness Centrality': betweenness_centrality[node],
             'Eigenvector Centrality': eigenvector_centrality[node]
         })
     
-    stats_df = pd.DataFrame(stats_data)
-    
     # Create output directory if it doesn't exist
     os.makedirs("network_visualizations", exist_ok=True)
     
-    # Save to CSV
-    stats_df.to_csv(f"network_visualizations/statistics_{professor_name.replace(' ', '_')}.csv", index=False)
+    # Stream rows straight to CSV
+    with open(f"network_visualizations/statistics_{professor_name.replace(' ', '_')}.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=['Node', 'Node Type', 'Degree Centrality', 'Closeness Centrality',
+                                               'Betweenness Centrality', 'Eigenvector Centrality'], lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(stats_data)
     print(f"Network statistics saved to network_visualizations/statistics_{professor_name.replace(' ', '_')}.csv")
     
     # Create an interactive visualization with node sizes based on centrality
     net = Network(height="750px", width="100%", bgcolor="#ffffff", font_color="black")
     
-    for node in G.nodes():
-        node_type = G.nodes[node]['node_type']
+    nodes = []
+    for node, attrs in G.nodes(data=True):
         title = f"{node}<br>Degree: {degree_centrality[node]:.3f}<br>Closeness: {closeness_centrality[node]:.3f}<br>Betweenness: {betweenness_centrality[node]:.3f}<br>Eigenvector: {eigenvector_centrality[node]:.3f}"
         
         # Size based on degree centrality (scaled)
-        size = 20 + degree_centrality[node] * 50
-        
-        if node_type == "professor":
-            net.add_node(node, label=node, title=title, color="#E41A1C", size=30)
+        if attrs['node_type'] == "professor":
+            nodes.append({"id": node, "title": title, "color": "#E41A1C", "size": 30})
         else:
-            net.add_node(node, label=node, title=title, color="#377EB8", size=size)
+            nodes.append({"id": node, "title": title, "color": "#377EB8", "size": 20 + degree_centrality[node] * 50})
     
-    for edge in G.edges():
-        net.add_edge(edge[0], edge[1])
+    edges = [{"from": u, "to": v} for u, v in G.edges()]
+    load_pyvis_network(net, nodes, edges)
     
     # Set physics layout options
     net.barnes_hut(spring_length=200, spring_strength=0.01, damping=0.09)
     
     # Save the centrality visualization
     filename = f"network_visualizations/centrality_{professor_name.replace(' ', '_')}.html"
-    net.save_graph(filename)
+    save_network_html(net, filename)
     print(f"Centrality visualization saved to {filename}")
 
+def process_profile(profile):
+    """Build, visualize and analyze one professor's network (runs in a worker process)"""
+    G = create_individual_network(profile)
+    visualize_individual_network_pyvis(G, profile["name"])
+    # Profiles already run one per process, so keep the path centralities serial here
+    analyze_network_statistics(G, profile["name"], workers=1)
+    print(f"Created network for {profile['name']}")
+
 def main():
     # List of Google Scholar IDs (Replace with actual IDs)
     scholar_ids = ["1Yl1h_YAAAAJ", "UBXqggoAAAAJ", "bmQ917cAAAAJ", "W4lc9bUAAAAJ", "OGQm6cwAAAAJ"]
     
     # Extract all profiles
     print("Extracting scholar profiles...")
-    profiles = [extract_scholar_profile(scholar_id) for scholar_id in scholar_ids]
+    profiles = fetch_profiles(scholar_ids)
     
-    # Generate and save individual networks
+    # Generate and save individual networks, one worker process per professor
     print("\nGenerating individual networks...")
-    for profile in profiles:
-        if profile:
-            G = create_individual_network(profile)
-            visualize_individual_network_pyvis(G, profile["name"])
-            analyze_network_statistics(G, profile["name"])
-            print(f"Created network for {profile['name']}")
+    fetched = [profile for profile in profiles if profile]
+    if fetched:
+        n_workers = min(len(fetched), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            list(executor.map(process_profile, fetched))
     
     # Generate and save shared connections network
     print("\nAnalyzing shared connections...")
@@ -1,25 +1,13 @@
-import pandas as pd
+import numpy as np
 import networkx as nx
 from pyvis.network import Network
-from scholarly import scholarly
+from scholar_io import fetch_profiles
+from network_html import load_pyvis_network, save_network_html
 from itertools import combinations
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import os
 
-def extract_scholar_profile(scholar_id):
-    """Extract single scholar profile and their coauthors"""
-    try:
-        author = scholarly.search_author_id(scholar_id)
-        author = scholarly.fill(author)
-        return {
-            "name": author.get("name", "N/A"),
-            "scholar_id": scholar_id,
-            "affiliation": author.get("affiliation", "N/A"),
-            "coauthors": author.get("coauthors", [])
-        }
-    except Exception as e:
-        print(f"Error retrieving data for ID {scholar_id}: {e}")
-        return None
-
 def create_individual_network(profile):
     """Create network for a single professor"""
     if not profile:
@@ -32,11 +20,10 @@ def create_individual_network(profile):
     G.add_node(prof_name, title=f"{prof_name}\n{profile['affiliation']}", 
                group="professor", size=25)
     
-    # Add coauthors and connections
-    for coauthor in profile["coauthors"]:
-        coauthor_name = coauthor["name"]
-        G.add_node(coauthor_name, title=coauthor_name, group="coauthor", size=15)
-        G.add_edge(prof_name, coauthor_name)
+    # Add coauthors and connections in bulk
+    G.add_nodes_from((coauthor_name, {"title": coauthor_name, "group": "coauthor", "size": 15})
+                     for coauthor_name in profile["coauthors"])
+    G.add_edges_from((prof_name, coauthor_name) for coauthor_name in profile["coauthors"])
     
     return G
 
@@ -62,55 +49,63 @@ def visualize_individual_network(G, professor_name):
     
     # Generate interactive HTML file
     filename = f"individual_network_{professor_name.replace(' ', '_')}.html"
-    net.save_graph(filename)
+    save_network_html(net, filename)
     print(f"Created interactive network for {professor_name} saved as {filename}")
     
     return filename
 
+def build_individual_network(profile):
+    """Create and visualize one professor's network, returning (name, filename)"""
+    G = create_individual_network(profile)
+    return profile["name"], visualize_individual_network(G, profile["name"])
+
 def create_combined_network(profiles):
     """Create a combined network of all professors and their coauthors"""
-    G = nx.Graph()
-    
-    # Process each professor profile
+    # One node per professor name: a repeated name keeps its latest profile's
+    # details and the union of its coauthors, so it is never paired with itself
+    professors = {}
+    professor_coauthors = defaultdict(dict)
     for profile in profiles:
         if profile:
-            prof_name = profile["name"]
-            # Add professor node
-            G.add_node(prof_name, title=f"{prof_name}\n{profile['affiliation']}", 
-                       group="professor", size=25)
-            
-            # Add coauthor nodes and connections
-            for coauthor in profile["coauthors"]:
-                coauthor_name = coauthor["name"]
-                # Check if this is a new coauthor
-                if not G.has_node(coauthor_name):
-                    G.add_node(coauthor_name, title=coauthor_name, group="coauthor", size=15)
-                G.add_edge(prof_name, coauthor_name)
-    
-    # Find shared coauthors and update their attributes
-    coauthor_connections = {}
-    for node in G.nodes():
-        if G.nodes[node].get('group') == 'coauthor':
-            connections = list(G.neighbors(node))
-            professors = [n for n in connections if G.nodes[n].get('group') == 'professor']
-            if len(professors) > 1:  # If connected to multiple professors
-                G.nodes[node]['group'] = 'shared_coauthor'
-                G.nodes[node]['size'] = 20
-                G.nodes[node]['title'] = f"{node}\nShared by: {', '.join(professors)}"
-                
-                # Add direct connections between professors who share this coauthor
-                for prof1, prof2 in combinations(professors, 2):
-                    if G.has_edge(prof1, prof2):
-                        # Increase weight if edge exists
-                        G[prof1][prof2]['weight'] = G[prof1][prof2].get('weight', 1) + 1
-                        # Update shared coauthors list
-                        if 'shared_coauthors' in G[prof1][prof2]:
-                            G[prof1][prof2]['shared_coauthors'].append(node)
-                        else:
-                            G[prof1][prof2]['shared_coauthors'] = [node]
-                    else:
-                        # Create new edge
-                        G.add_edge(prof1, prof2, weight=1, shared_coauthors=[node])
+            professors[profile["name"]] = profile
+            professor_coauthors[profile["name"]].update(dict.fromkeys(profile["coauthors"]))
+    
+    # Index each coauthor's professors in one pass; professors listed as
+    # someone's coauthor keep their professor role
+    coauthor_to_profs = defaultdict(list)
+    coauthor_edges = []
+    for prof_name in professors:
+        for coauthor_name in professor_coauthors[prof_name]:
+            coauthor_edges.append((prof_name, coauthor_name))
+            if coauthor_name not in professors:
+                coauthor_to_profs[coauthor_name].append(prof_name)
+    
+    # Derive every node's attributes and the professor-professor links from the index
+    professor_nodes = [(prof_name, {"title": f"{prof_name}\n{profile['affiliation']}",
+                                    "group": "professor", "size": 25})
+                       for prof_name, profile in professors.items()]
+    coauthor_nodes = []
+    shared_map = defaultdict(list)
+    for coauthor_name, professors in coauthor_to_profs.items():
+        if len(professors) > 1:  # If connected to multiple professors
+            coauthor_nodes.append((coauthor_name, {"title": f"{coauthor_name}\nShared by: {', '.join(professors)}",
+                                                   "group": "shared_coauthor", "size": 20}))
+            for prof1, prof2 in combinations(professors, 2):
+                shared_map[(prof1, prof2)].append(coauthor_name)
+        else:
+            coauthor_nodes.append((coauthor_name, {"title": coauthor_name, "group": "coauthor", "size": 15}))
+    
+    # Build the graph with one bulk insert per node and edge class
+    G = nx.Graph()
+    G.add_nodes_from(professor_nodes)
+    G.add_nodes_from(coauthor_nodes)
+    G.add_edges_from(coauthor_edges)
+    
+    # A professor listed directly as a coauthor adds one to the shared weight
+    professor_edges = [(prof1, prof2, {"weight": len(shared) + G.has_edge(prof1, prof2),
+                                       "shared_coauthors": shared})
+                       for (prof1, prof2), shared in shared_map.items()]
+    G.add_edges_from(professor_edges)
     
     return G
 
@@ -125,35 +120,23 @@ def visualize_combined_network(G):
     # Configure physics for better visualization
     net.barnes_hut(spring_length=200, spring_strength=0.05, damping=0.09, gravity=-80000)
     
-    # Set node colors by group
-    color_map = {
-        "professor": "#e41a1c",          # Red
-        "coauthor": "#377eb8",           # Blue
-        "shared_coauthor": "#4daf4a"     # Green
-    }
+    # Build node payloads; vis.js colors nodes by group (pyvis drops explicit colors on grouped nodes)
+    nodes = [{"id": node, "label": node, "title": attrs.get('title', node),
+              "group": attrs.get('group', 'default'), "size": attrs.get('size', 15)}
+             for node, attrs in G.nodes(data=True)]
     
-    # Add nodes from networkx graph
-    for node, attrs in G.nodes(data=True):
-        group = attrs.get('group', 'default')
-        color = color_map.get(group, "#cccccc")
-        net.add_node(node, label=node, title=attrs.get('title', node), 
-                     group=group, size=attrs.get('size', 15), color=color)
-    
-    # Add edges from networkx graph with varying widths based on weight
-    for source, target, attrs in G.edges(data=True):
-        weight = attrs.get('weight', 1)
-        # Make professor-professor connections thicker and highlighted
-        if (G.nodes[source].get('group') == 'professor' and 
-            G.nodes[target].get('group') == 'professor'):
-            width = weight * 3
-            title = f"Shared coauthors: {', '.join(attrs.get('shared_coauthors', []))}"
-            color = "#ff9900"  # Orange for professor-professor connections
-        else:
-            width = 1
-            title = ""
-            color = "#999999"  # Grey for other connections
-            
-        net.add_edge(source, target, width=width, title=title, color=color)
+    # Classify every edge at once; professor-professor connections are thicker and highlighted
+    groups = nx.get_node_attributes(G, 'group')
+    edge_list = list(G.edges(data=True))
+    is_pp = np.fromiter((groups.get(source) == 'professor' and groups.get(target) == 'professor'
+                         for source, target, _ in edge_list), dtype=bool, count=len(edge_list))
+    weights = np.array([attrs.get('weight', 1) for _, _, attrs in edge_list])
+    widths = np.where(is_pp, weights * 3, 1).tolist()
+    colors = np.where(is_pp, "#ff9900", "#999999").tolist()  # Orange for professor-professor, grey otherwise
+    edges = [{"from": source, "to": target, "width": width, "color": color,
+              "title": f"Shared coauthors: {', '.join(attrs.get('shared_coauthors', []))}" if pp else ""}
+             for (source, target, attrs), pp, width, color in zip(edge_list, is_pp, widths, colors)]
+    load_pyvis_network(net, nodes, edges)
     
     # Add legend as HTML
     net.set_options("""
@@ -183,7 +166,7 @@ def visualize_combined_network(G):
     
     # Save the network visualization
     filename = "combined_network.html"
-    net.save_graph(filename)
+    save_network_html(net, filename)
     print(f"Created combined network visualization saved as {filename}")
     
     return filename
@@ -191,9 +174,10 @@ def visualize_combined_network(G):
 def print_shared_connections(G):
     """Print details of shared connections between professors"""
     print("\nShared Connections Analysis:")
+    groups = nx.get_node_attributes(G, 'group')
     for (prof1, prof2, attrs) in G.edges(data=True):
-        if (G.nodes[prof1].get('group') == "professor" and 
-            G.nodes[prof2].get('group') == "professor"):
+        if (groups.get(prof1) == "professor" and 
+            groups.get(prof2) == "professor"):
             if 'shared_coauthors' in attrs:
                 shared = attrs['shared_coauthors']
                 print(f"\n{prof1} and {prof2} share {len(shared)} coauthor(s):")
@@ -205,20 +189,19 @@ def create_integrated_visualization(profiles):
     individual_htmls = []
     combined_html = ""
     
-    # First create all individual networks and the combined network
-    for profile in profiles:
-        if profile:
-            G = create_individual_network(profile)
-            filename = visualize_individual_network(G, profile["name"])
-            individual_htmls.append((profile["name"], filename))
+    # First create all individual networks in worker processes, then the combined network
+    fetched = [profile for profile in profiles if profile]
+    if fetched:
+        n_workers = min(len(fetched), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            individual_htmls = list(executor.map(build_individual_network, fetched))
     
     combined_G = create_combined_network(profiles)
     combined_html = visualize_combined_network(combined_G)
     print_shared_connections(combined_G)
     
-    # Create an index.html file with links to all visualizations
-    with open("index.html", "w") as f:
-        f.write("""
+    # Build index.html in memory and write it with a single call
+    parts = ["""
         <!DOCTYPE html>
         <html>
         <head>
@@ -246,12 +229,11 @@ def create_integrated_visualization(profiles):
             
             <div class="nav">
                 <a href="combined_network.html" target="_blank">Combined Network</a>
-        """)
-        
-        for name, html_file in individual_htmls:
-            f.write(f'<a href="{html_file}" target="_blank">{name}</a>\n')
-        
-        f.write("""
+        """]
+    
+    parts.extend(f'<a href="{html_file}" target="_blank">{name}</a>\n' for name, html_file in individual_htmls)
+    
+    parts.append("""
             </div>
             
             <h2>How to Use This Visualization</h2>
@@ -274,6 +256,10 @@ def create_integrated_visualization(profiles):
         </html>
         """)
     
+    # Create an index.html file with links to all visualizations
+    with open("index.html", "w") as f:
+        f.write("".join(parts))
+    
     print("\nCreated index.html with links to all network visualizations")
 
 def main():
@@ -282,7 +268,7 @@ def main():
     
     # Extract all profiles
     print("Extracting scholar profiles...")
-    profiles = [extract_scholar_profile(scholar_id) for scholar_id in scholar_ids]
+    profiles = fetch_profiles(scholar_ids)
     
     # Create directory for visualizations if it doesn't exist
     if not os.path.exists("visualizations"):
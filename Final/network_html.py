@@ -0,0 +1,114 @@
+import os
+import re
+import shutil
+from jinja2.exceptions import TemplateNotFound
+from jinja2.utils import htmlsafe_json_dumps
+
+# Template expressions that carry the per-network payload, and their placeholders
+PAYLOAD_FIELDS = {
+    "{{nodes|tojson}}": "__NETWORK_NODES__",
+    "{{edges|tojson}}": "__NETWORK_EDGES__",
+    "{{options|safe}}": "__NETWORK_OPTIONS__",
+}
+PLACEHOLDER_PATTERN = re.compile("(" + "|".join(PAYLOAD_FIELDS.values()) + ")")
+
+# Rendered page shells, keyed by every template input other than the payload
+_page_shells = {}
+
+def physics_enabled(net):
+    """Mirror pyvis' check for whether the physics simulation is on"""
+    if isinstance(net.options, dict):
+        return net.options.get("physics", {}).get("enabled", True)
+    return net.options.physics.enabled
+
+def copy_local_assets(net):
+    """Copy the vis.js/tom-select bundles next to the HTML, as pyvis does for local resources"""
+    for lib in ("bindings", "tom-select", "vis-9.1.2"):
+        target = os.path.join("lib", lib)
+        if not os.path.exists(target):
+            # Worker processes may race to create the same directory
+            shutil.copytree(os.path.join(net.template_dir, "lib", lib), target, dirs_exist_ok=True)
+
+def render_page_shell(net, nodes, tooltip_link):
+    """Render the pyvis page template once with placeholders in place of the payload"""
+    env = net.templateEnv
+    source = env.loader.get_source(env, net.path)[0]
+    if not all(field in source for field in PAYLOAD_FIELDS):
+        return None
+    for field, placeholder in PAYLOAD_FIELDS.items():
+        source = source.replace(field, placeholder)
+
+    # nodes is still passed for the template's size check (loading bar above 100 nodes)
+    shell = env.from_string(source).render(height=net.height,
+                                           width=net.width,
+                                           nodes=nodes,
+                                           heading=net.heading,
+                                           physics_enabled=physics_enabled(net),
+                                           use_DOT=net.use_DOT,
+                                           dot_lang=net.dot_lang,
+                                           widget=net.widget,
+                                           bgcolor=net.bgcolor,
+                                           conf=net.conf,
+                                           tooltip_link=tooltip_link,
+                                           neighborhood_highlight=net.neighborhood_highlight,
+                                           select_menu=net.select_menu,
+                                           filter_menu=net.filter_menu,
+                                           notebook=False,
+                                           cdn_resources=net.cdn_resources)
+    return PLACEHOLDER_PATTERN.split(shell)
+
+def load_pyvis_network(net, nodes, edges):
+    """Bulk-load node and edge option dicts into a pyvis network, bypassing add_node/add_edge"""
+    # Fill in the defaults add_node would have set
+    for node in nodes:
+        node.setdefault("label", node["id"])
+        node.setdefault("shape", net.shape)
+        if net.font_color:
+            node["font"] = {"color": net.font_color}
+    
+    net.nodes = nodes
+    net.node_ids = [node["id"] for node in nodes]
+    net.node_map = {node["id"]: node for node in nodes}
+    net.edges = edges
+    return net
+
+def save_network_html(net, filename):
+    """Write a pyvis network to HTML, rendering the page template only once per layout"""
+    # Select and filter menus embed per-node markup, so they need a full render
+    if net.select_menu or net.filter_menu:
+        net.save_graph(filename)
+        return
+
+    # The fast path reads pyvis internals; if a pyvis release renames them, let pyvis render the page
+    try:
+        nodes, edges, heading, height, width, options = net.get_network_data()
+        tooltip_link = any("href" in node.get("title", "") for node in nodes)
+        key = (height, width, heading, net.bgcolor, physics_enabled(net), len(nodes) > 100,
+               tooltip_link, net.use_DOT, net.dot_lang, net.widget, net.conf,
+               net.neighborhood_highlight, net.cdn_resources)
+        if key not in _page_shells:
+            _page_shells[key] = render_page_shell(net, nodes, tooltip_link)
+        shell = _page_shells[key]
+    except (AttributeError, TemplateNotFound):
+        shell = None
+    if shell is None:
+        # Unrecognised template layout or pyvis internals; let pyvis render it
+        net.save_graph(filename)
+        return
+
+    payload = {
+        PAYLOAD_FIELDS["{{nodes|tojson}}"]: str(htmlsafe_json_dumps(nodes, sort_keys=True)),
+        PAYLOAD_FIELDS["{{edges|tojson}}"]: str(htmlsafe_json_dumps(edges, sort_keys=True)),
+        PAYLOAD_FIELDS["{{options|safe}}"]: options,
+    }
+    # Odd-indexed parts of the split shell are the placeholders
+    html = "".join(payload[part] if i % 2 else part for i, part in enumerate(shell))
+
+    if net.cdn_resources == "local":
+        try:
+            copy_local_assets(net)
+        except AttributeError:
+            net.save_graph(filename)
+            return
+    with open(filename, "w") as out:
+        out.write(html)
@@ -0,0 +1,91 @@
+from scholarly import scholarly, MaxTriesExceededException
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import random
+import shelve
+import time
+
+# Minimum delay in seconds between consecutive Google Scholar requests
+REQUEST_INTERVAL = 1.0
+# Upper bound on concurrent profile fetches
+MAX_FETCH_WORKERS = 8
+# On-disk cache of fetched profiles, keyed by scholar ID
+CACHE_PATH = ".scholar_cache"
+CACHE_TTL_DAYS = 7
+# Attempts per request before a throttled fetch is given up
+MAX_RETRIES = 5
+
+_rate_limit_lock = threading.Lock()
+_last_request_time = 0.0
+_cache_lock = threading.Lock()
+
+def wait_for_rate_limit():
+    """Block until another Google Scholar request may be sent"""
+    global _last_request_time
+    with _rate_limit_lock:
+        delay = _last_request_time + REQUEST_INTERVAL - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        _last_request_time = time.monotonic()
+
+def scholar_request(call, *args):
+    """Run one rate-limited scholarly call, backing off and retrying while throttled"""
+    for attempt in range(MAX_RETRIES):
+        wait_for_rate_limit()
+        try:
+            return call(*args)
+        except MaxTriesExceededException:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            # Exponential backoff with jitter so threads don't retry in lockstep;
+            # scholarly's exceptions carry no response headers to read Retry-After from
+            delay = 2 ** attempt + random.random()
+            print(f"Rate limited by Google Scholar, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+def load_cached_profile(scholar_id, ttl_days=CACHE_TTL_DAYS):
+    """Return the cached profile for scholar_id, or None if missing or older than ttl_days"""
+    with _cache_lock, shelve.open(CACHE_PATH) as cache:
+        entry = cache.get(scholar_id)
+    if entry and time.time() - entry["fetched_at"] < ttl_days * 86400:
+        return entry["profile"]
+    return None
+
+def save_cached_profile(scholar_id, profile):
+    """Store a freshly fetched profile in the on-disk cache"""
+    with _cache_lock, shelve.open(CACHE_PATH) as cache:
+        cache[scholar_id] = {"fetched_at": time.time(), "profile": profile}
+
+def extract_scholar_profile(scholar_id, ttl_days=CACHE_TTL_DAYS):
+    """Extract single scholar profile and their coauthors, reusing cached results"""
+    profile = load_cached_profile(scholar_id, ttl_days)
+    if profile:
+        return profile
+    
+    try:
+        author = scholar_request(scholarly.search_author_id, scholar_id)
+        author = scholar_request(scholarly.fill, author)
+        profile = {
+            "name": author.get("name", "N/A"),
+            "scholar_id": scholar_id,
+            "affiliation": author.get("affiliation", "N/A"),
+            # Unique coauthor names in Scholar's order, so downstream loops skip repeats
+            "coauthors": tuple(dict.fromkeys(coauthor["name"] for coauthor in author.get("coauthors", [])))
+        }
+    except Exception as e:
+        print(f"Error retrieving data for ID {scholar_id}: {e}")
+        return None
+    
+    save_cached_profile(scholar_id, profile)
+    return profile
+
+def fetch_profiles(scholar_ids):
+    """Fetch several scholar profiles concurrently, keeping the order of scholar_ids"""
+    # ThreadPoolExecutor rejects max_workers=0
+    if not scholar_ids:
+        return []
+    
+    # scholarly routes every request through one shared httpx client, so the
+    # worker threads reuse its pooled connections instead of opening their own
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(scholar_ids))) as executor:
+        return list(executor.map(extract_scholar_profile, scholar_ids))
\ No newline at end of file
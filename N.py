@@ -1,23 +1,14 @@
 import pandas as pd
+import numpy as np
 import networkx as nx
+import matplotlib
+# Render straight to files; no GUI toolkit is needed
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-from scholarly import scholarly
+from Final.scholar_io import fetch_profiles
+from Final.centrality import sparse_degree_centrality, sparse_eigenvector_centrality, parallel_path_centralities
 from itertools import combinations
-
-def extract_scholar_profile(scholar_id):
-    """Extract single scholar profile and their coauthors"""
-    try:
-        author = scholarly.search_author_id(scholar_id)
-        author = scholarly.fill(author)
-        return {
-            "name": author.get("name", "N/A"),
-            "scholar_id": scholar_id,
-            "affiliation": author.get("affiliation", "N/A"),
-            "coauthors": author.get("coauthors", [])
-        }
-    except Exception as e:
-        print(f"Error retrieving data for ID {scholar_id}: {e}")
-        return None
+from collections import defaultdict
 
 def create_individual_network(profile):
     """Create network for a single professor"""
@@ -30,69 +21,85 @@ def create_individual_network(profile):
     # Add professor as central node
     G.add_node(prof_name, node_type="professor")
     
-    # Add coauthors and connections
-    for coauthor in profile["coauthors"]:
-        coauthor_name = coauthor["name"]
-        G.add_node(coauthor_name, node_type="coauthor")
-        G.add_edge(prof_name, coauthor_name)
+    # Add coauthors and connections in bulk
+    G.add_nodes_from(profile["coauthors"], node_type="coauthor")
+    G.add_edges_from((prof_name, coauthor_name) for coauthor_name in profile["coauthors"])
     
     return G
 
+def draw_network(ax, G, pos, other_color, edge_width=1.0):
+    """Draw G on ax with professors in red and every other node in other_color"""
+    # Classify nodes once and derive both colors and sizes from the same mask
+    node_types = nx.get_node_attributes(G, 'node_type')
+    nodes = list(G)
+    is_professor = np.fromiter((node_types[node] == "professor" for node in nodes), dtype=bool, count=len(nodes))
+    
+    ax.set_axis_off()
+    nx.draw_networkx_nodes(G, pos, nodelist=nodes, ax=ax, alpha=0.7,
+                           node_color=np.where(is_professor, 'red', other_color).tolist(),
+                           node_size=np.where(is_professor, 3000, 1000))
+    nx.draw_networkx_edges(G, pos, ax=ax, width=edge_width, edge_color='gray', alpha=0.7)
+    nx.draw_networkx_labels(G, pos, ax=ax, font_size=8, alpha=0.7)
+
 def visualize_individual_network(G, professor_name):
     """Visualize network for a single professor"""
     if not G:
         return
     
-    plt.figure(figsize=(12, 8))
-    pos = nx.spring_layout(G, k=1)
+    # Frameless axes with a fixed strip left for the title, so no tight-bbox pass is needed
+    fig = plt.figure(figsize=(12, 8))
+    ax = fig.add_axes((0, 0, 1, 0.95))
+    # Star graphs settle quickly, so fewer iterations suffice; the seed keeps plots reproducible
+    pos = nx.spring_layout(G, k=1, seed=42, iterations=20)
     
     # Draw nodes with different colors for professor and coauthors
-    node_colors = ['red' if G.nodes[node]['node_type'] == "professor" else 'lightblue' 
-                  for node in G.nodes()]
-    
-    nx.draw(G, pos,
-            node_color=node_colors,
-            node_size=[3000 if G.nodes[node]['node_type'] == "professor" else 1000 
-                      for node in G.nodes()],
-            with_labels=True,
-            font_size=8,
-            edge_color='gray',
-            alpha=0.7)
-    
-    plt.title(f"Collaboration Network - {professor_name}")
-    plt.savefig(f"individual_network_{professor_name.replace(' ', '_')}.png", 
-                bbox_inches='tight')
-    plt.close()
+    draw_network(ax, G, pos, 'lightblue')
+    
+    ax.set_title(f"Collaboration Network - {professor_name}")
+    fig.savefig(f"individual_network_{professor_name.replace(' ', '_')}.png", dpi=100)
+    plt.close(fig)
 
 def find_shared_connections(profiles):
     """Create network showing connections shared between professors"""
     G = nx.Graph()
     
-    # Dictionary to store each professor's coauthors
-    prof_coauthors = {}
-    
-    # Collect all coauthors for each professor
-    for profile in profiles:
-        if profile:
-            prof_name = profile["name"]
-            coauthors = set(coauthor["name"] for coauthor in profile["coauthors"])
-            prof_coauthors[prof_name] = coauthors
-            
-            # Add professor node
-            G.add_node(prof_name, node_type="professor")
-    
-    # Find shared connections between professors
-    for (prof1, coauthors1), (prof2, coauthors2) in combinations(prof_coauthors.items(), 2):
-        shared = coauthors1.intersection(coauthors2)
-        if shared:
-            # Add edge between professors with shared connections
-            G.add_edge(prof1, prof2, weight=len(shared), shared_coauthors=list(shared))
-            
-            # Add shared coauthor nodes and their connections
-            for coauthor in shared:
-                G.add_node(coauthor, node_type="shared_coauthor")
-                G.add_edge(prof1, coauthor)
-                G.add_edge(prof2, coauthor)
+    # One profile per professor name; a repeated name keeps its latest profile
+    professors = {profile["name"]: profile for profile in profiles if profile}
+    
+    # Add professor nodes
+    G.add_nodes_from(professors, node_type="professor")
+    
+    # Index each coauthor's professors straight from the profiles (coauthor
+    # names are already unique per profile) without building per-professor sets
+    coauthor_to_profs = defaultdict(list)
+    for prof_name, profile in professors.items():
+        for coauthor in profile["coauthors"]:
+            coauthor_to_profs[coauthor].append(prof_name)
+    
+    # Only coauthors with several professors produce shared connections
+    shared_map = defaultdict(list)
+    for coauthor, profs in coauthor_to_profs.items():
+        if len(profs) > 1:
+            for prof1, prof2 in combinations(profs, 2):
+                shared_map[(prof1, prof2)].append(coauthor)
+    
+    # Collect pairs in professor order so the graph matches the pairwise scan
+    prof_order = {prof_name: i for i, prof_name in enumerate(professors)}
+    shared_nodes = {}
+    edges = []
+    for prof1, prof2 in sorted(shared_map, key=lambda pair: (prof_order[pair[0]], prof_order[pair[1]])):
+        shared = shared_map[(prof1, prof2)]
+        
+        # Edge between professors with shared connections, then the shared coauthors' edges
+        edges.append((prof1, prof2, {"weight": len(shared), "shared_coauthors": shared}))
+        for coauthor in shared:
+            shared_nodes[coauthor] = None
+            edges.append((prof1, coauthor))
+            edges.append((prof2, coauthor))
+    
+    # Add shared coauthor nodes and all connections in bulk
+    G.add_nodes_from(shared_nodes, node_type="shared_coauthor")
+    G.add_edges_from(edges)
     
     return G
 
@@ -102,59 +109,48 @@ def visualize_shared_network(G):
         print("No shared connections found between professors")
         return
     
-    plt.figure(figsize=(15, 10))
-    pos = nx.spring_layout(G, k=1)
-    
-    # Draw nodes with different colors for professors and shared coauthors
-    node_colors = []
-    node_sizes = []
-    for node in G.nodes():
-        if G.nodes[node]['node_type'] == "professor":
-            node_colors.append('red')
-            node_sizes.append(3000)
-        else:
-            node_colors.append('lightgreen')
-            node_sizes.append(1000)
-    
-    # Draw edges with varying thickness based on number of shared connections
-    edge_weights = [G[u][v].get('weight', 1) for u, v in G.edges()]
-    
-    nx.draw(G, pos,
-            node_color=node_colors,
-            node_size=node_sizes,
-            with_labels=True,
-            font_size=8,
-            width=edge_weights,
-            edge_color='gray',
-            alpha=0.7)
+    # Leave fixed room for the title above and the legend on the right
+    fig = plt.figure(figsize=(15, 10))
+    ax = fig.add_axes((0, 0, 0.85, 0.95))
+    pos = nx.spring_layout(G, k=1, seed=42)
+    
+    # Draw nodes with different colors for professors and shared coauthors, and
+    # edges with varying thickness based on number of shared connections
+    edge_weights = [weight for _, _, weight in G.edges(data='weight', default=1)]
+    draw_network(ax, G, pos, 'lightgreen', edge_width=edge_weights)
     
     # Add legend
     legend_elements = [plt.Line2D([0], [0], marker='o', color='w', 
                                  markerfacecolor=c, label=l, markersize=10)
                       for c, l in [('red', 'Professors'),
                                  ('lightgreen', 'Shared Collaborators')]]
-    plt.legend(handles=legend_elements, loc='upper left', bbox_to_anchor=(1, 1))
+    ax.legend(handles=legend_elements, loc='upper left', bbox_to_anchor=(1, 1))
     
-    plt.title("Shared Connections Between Professors")
-    plt.savefig("shared_connections_network.png", bbox_inches='tight')
-    plt.close()
+    ax.set_title("Shared Connections Between Professors")
+    fig.savefig("shared_connections_network.png", dpi=100)
+    plt.close(fig)
 
 def print_shared_connections(G):
     """Print details of shared connections between professors"""
     print("\nShared Connections Analysis:")
-    for (prof1, prof2) in G.edges():
-        if G.nodes[prof1]['node_type'] == "professor" and G.nodes[prof2]['node_type'] == "professor":
-            shared = G[prof1][prof2]['shared_coauthors']
+    # Only professor-professor edges carry the shared_coauthors attribute
+    for prof1, prof2, shared in G.edges(data='shared_coauthors'):
+        if shared:
             print(f"\n{prof1} and {prof2} share {len(shared)} coauthor(s):")
             for coauthor in shared:
                 print(f"  - {coauthor}")
                 
 def analyze_network_statistics(G, professor_name):
     """Analyze network statistics for centrality and connectivity."""
-    degree_centrality = nx.degree_centrality(G)
-    closeness_centrality = nx.closeness_centrality(G)
-    betweenness_centrality = nx.betweenness_centrality(G)
-    eigenvector_centrality = nx.eigenvector_centrality(G, max_iter=1000, tol=1e-6)
+    # Build the sparse adjacency matrix once and derive the centralities from it
+    nodes = list(G.nodes())
+    A = nx.to_scipy_sparse_array(G, nodelist=nodes, dtype=float, weight=None, format="csr")
+    degree_centrality = dict(zip(nodes, sparse_degree_centrality(A).tolist()))
+    # Closeness reuses the distances from the betweenness BFS
+    betweenness, closeness = parallel_path_centralities(A)
+    closeness_centrality = dict(zip(nodes, closeness.tolist()))
+    betweenness_centrality = dict(zip(nodes, betweenness.tolist()))
+    eigenvector_centrality = dict(zip(nodes, sparse_eigenvector_centrality(A, max_iter=1000, tol=1e-6).tolist()))
 
     print(f"\nStatistical Measures for {professor_name}")
     print(f"Degree Centrality: {degree_centrality}")
@@ -162,29 +158,33 @@ def analyze_network_statistics(G, professor_name):
     print(f"Betweenness Centrality: {betweenness_centrality}")
     print(f"Eigenvector Centrality: {eigenvector_centrality}")
 
-    # Plotting with adjusted bar width
-    plt.figure(figsize=(12, 6))
-    x = range(len(degree_centrality))
-    
-    plt.bar(x, degree_centrality.values(), color='blue', label='Degree Centrality', width=0.2)
-    plt.bar(x, closeness_centrality.values(), color='green', label='Closeness Centrality', width=0.2)
-    plt.bar(x, betweenness_centrality.values(), color='red', label='Betweenness Centrality', width=0.2)
-    plt.bar(x, eigenvector_centrality.values(), color='purple', label='Eigenvector Centrality', width=0.2)
-    
-    plt.xticks(x, list(degree_centrality.keys()), rotation=45, ha='right')
-    plt.legend()
-    plt.title(f'Graph-Based Statistical Measures - {professor_name}')
-    plt.tight_layout()
-    plt.savefig(f"statistics_{professor_name.replace(' ', '_')}.png")
-    plt.close()
+    # Plot the four measures as grouped bars, offset side by side around each node's tick
+    fig, ax = plt.subplots(figsize=(12, 6))
+    x = np.arange(len(nodes))
+    width = 0.2
+    metrics = [(degree_centrality, 'blue', 'Degree Centrality'),
+               (closeness_centrality, 'green', 'Closeness Centrality'),
+               (betweenness_centrality, 'red', 'Betweenness Centrality'),
+               (eigenvector_centrality, 'purple', 'Eigenvector Centrality')]
+    offsets = (np.arange(len(metrics)) - (len(metrics) - 1) / 2) * width
+    for offset, (centrality, color, label) in zip(offsets, metrics):
+        ax.bar(x + offset, [centrality[node] for node in nodes], color=color, label=label, width=width)
+    
+    ax.set_xticks(x, nodes, rotation=45, ha='right')
+    ax.legend()
+    ax.set_title(f'Graph-Based Statistical Measures - {professor_name}')
+    # Fixed margins leave room for the rotated names without a tight_layout pass
+    fig.subplots_adjust(left=0.08, right=0.98, top=0.93, bottom=0.28)
+    fig.savefig(f"statistics_{professor_name.replace(' ', '_')}.png", dpi=100)
+    plt.close(fig)
 
 
 def main():
     # List of Google Scholar IDs (Replace with actual IDs)
     scholar_ids = ["1Yl1h_YAAAAJ", "UBXqggoAAAAJ", "bmQ917cAAAAJ", "W4lc9bUAAAAJ", "OGQm6cwAAAAJ"]
     
-    # Extract all profiles
-    profiles = [extract_scholar_profile(scholar_id) for scholar_id in scholar_ids]
+    # Extract all profiles concurrently; results keep the order of scholar_ids
+    profiles = fetch_profiles(scholar_ids)
     
     # Generate and save individual networks
     # print("Generating individual networks...")